@@ -6,5 +6,7 @@ from aperol import config
 load_config = config.load_config
 parse_config = config.parse_config
 dump_config = config.dump_config
+dump_config_to = config.dump_config_to
 register_config_path = config.register_config_path
 register_imports = config.register_imports
+clear_config_cache = config.clear_config_cache
@@ -12,14 +12,14 @@ PickleState = tuple[type[T], dict[str, Any] | None, dict[str, Any] | None]
 class partial_cls(Generic[T]):
     """Create new class with partial application of the given keyword arguments."""
 
-    __slots__ = "obj_cls", "kwargs", "__dict__", "__weakref__"
+    __slots__ = "obj_cls", "kwargs", "__weakref__"
 
     def __new__(cls, obj_cls: Union[type[T], "partial_cls"], /, **kwargs: Any) -> "partial_cls":
         if not isinstance(obj_cls, type) and not isinstance(obj_cls, partial_cls):
             raise TypeError("the first argument must be class")
 
         if isinstance(obj_cls, partial_cls):
-            kwargs = {**obj_cls.kwargs, **kwargs}
+            kwargs = obj_cls.kwargs | kwargs
             obj_cls = obj_cls.obj_cls
 
         self = super().__new__(cls)
@@ -29,8 +29,9 @@ class partial_cls(Generic[T]):
         return self
 
     def __call__(self, *args, **kwargs: Any) -> T:
-        kwargs = {**self.kwargs, **kwargs}
-        return self.obj_cls(*args, **kwargs)
+        if not kwargs:
+            return self.obj_cls(*args, **self.kwargs)
+        return self.obj_cls(*args, **(self.kwargs | kwargs))
 
     @reprlib.recursive_repr()
     def __repr__(self) -> str:
@@ -45,7 +46,8 @@ class partial_cls(Generic[T]):
         return (
             type(self),
             (self.obj_cls,),
-            (self.obj_cls, self.kwargs or None, self.__dict__ or None),
+            # instance namespace only exists for subclasses which do not define __slots__
+            (self.obj_cls, self.kwargs or None, getattr(self, "__dict__", None) or None),
         )
 
     def __setstate__(self, state: PickleState) -> None:
@@ -66,9 +68,7 @@ class partial_cls(Generic[T]):
             kwargs = {}
         elif type(kwargs) is not dict:
             kwargs = dict(kwargs)
-        if namespace is None:
-            namespace = {}
-
-        self.__dict__ = namespace
+        if namespace:
+            vars(self).update(namespace)  # raises TypeError if instance attributes are unsupported
         self.obj_cls = obj_cls
         self.kwargs = kwargs
@@ -1,53 +1,108 @@
 """Config parser."""
 
+import builtins
 import functools
 import importlib
-import importlib.resources
-import importlib.util
-import inspect
+import io
+import keyword
+import os
 import pathlib
-import pkgutil
-import warnings
-from collections.abc import Callable, Mapping, Sequence
-from typing import Any, Union
+import threading
+import types
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from typing import Any, TextIO, TypeGuard, Union
 
 # TODO(rpeloff) support different config formats, e.g. YAML, JSON
-import yaml
+# NOTE: yaml, inspect, pkgutil, json and warnings are imported where they are used to reduce the
+# import time of aperol, since they are only required when loading configs or resolving objects
 
 from aperol import clstools
 from aperol import tree_utils
 
 
 SearchPkgs = Sequence[Union[str, tuple[str, str]]]
+CanonicalSearchPkgs = tuple[tuple[str, str | None], ...]
 
 
 _REGISTERED_CONFIG_PATHS: list[pathlib.Path] = []
-_REGISTERED_SEARCH_PKGS: list[str | tuple[str, str]] = []
-
+_REGISTERED_SEARCH_PKGS: dict[str | tuple[str, str], None] = {}  # ordered set
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int], Any, SearchPkgs | None]] = {}
+_PKG_INDEX: dict[str, dict[str, str]] = {}
+_PKG_MODULES: dict[str, list[tuple[str, bool]]] = {}
+_PKG_WALK_POSITIONS: dict[str, int] = {}
+_PKG_LAZY_MODULES: dict[str, dict[str, Any]] = {}
+_PKG_LOCK = threading.RLock()
+_YAML_CACHE_ENV = "APEROL_YAML_CACHE"
+_YAML_CACHE_SUFFIX = ".cache.json"
+
+
+# concrete leaf types produced by the YAML (and JSON) loaders
+_LEAF_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _is_sequence_node(value: Any) -> TypeGuard[Sequence[Any]]:
+    value_type = type(value)
+    if value_type is list:
+        return True
+    if value_type is dict or value_type in _LEAF_TYPES:
+        return False
+    return isinstance(value, Sequence)
+
+
+def _format_node_path(node_link: tuple[Any, ...] | None) -> str:
+    keys = []
+    while node_link is not None:
+        node_link, key = node_link
+        keys.append(str(key))
+    return ".".join(reversed(keys))
+
+
+def _node_type_error(node_path: str, node_type: Any) -> ValueError:
+    return ValueError(
+        f"Expected string for key 'type' in config for node {node_path}. "
+        f"Got type = {type(node_type)}."
+    )
 
-def _check_valid_config_tree(node_config: Any, node_key: str = "", node_path: str = "") -> None:
-    if isinstance(node_config, Sequence) and not isinstance(node_config, str):
-        for i, child_config in enumerate(node_config):
-            _check_valid_config_tree(
-                child_config, node_path=f"{node_path}.{i}" if node_path else str(i)
-            )
 
-    if isinstance(node_config, Mapping):
-        for child_key, child_config in node_config.items():
-            _check_valid_config_tree(
-                child_config,
-                node_key=child_key,
-                node_path=f"{node_path}.{child_key}" if node_path else child_key,
-            )
+def _check_valid_config_tree(config: Any) -> None:
+    # iterative depth-first walk where each node holds a (parent, key) link to build its path
+    # lazily, since the path is only needed to report an invalid node
+    # NOTE: scalar leaves are never pushed since only mapping nodes can hold an invalid type, and
+    # containers are pushed once by id since YAML anchors may share (or recursively nest) nodes
+    stack: list[tuple[Any, tuple[Any, ...] | None]] = [(config, None)]
+    visited = {id(config)}
+    while stack:
+        node_config, node_link = stack.pop()
+
+        children: Iterable[tuple[Any, Any]]
+        if _is_sequence_node(node_config):
+            children = enumerate(node_config)
+        elif tree_utils._is_mapping(node_config):
+            if "type" in node_config and not isinstance(node_config["type"], str):
+                raise _node_type_error(_format_node_path((node_link, "type")), node_config["type"])
+            children = node_config.items()
+        else:
+            continue
 
-    if node_key == "type" and not isinstance(node_config, str):
-        raise ValueError(
-            f"Expected string for key 'type' in config for node {node_path}. "
-            f"Got type = {type(node_config)}."
-        )
+        for child_key, child_config in children:
+            if type(child_config) not in _LEAF_TYPES and id(child_config) not in visited:
+                visited.add(id(child_config))
+                stack.append((child_config, (node_link, child_key)))
 
 
 def _check_and_format_search_pkgs(search_pkgs: SearchPkgs) -> SearchPkgs:
+    # convert [name, alias] lists loaded from YAML to tuples so that the imports are hashable
+    hashable_pkgs = tuple(
+        tuple(pkg_name) if type(pkg_name) is list else pkg_name for pkg_name in search_pkgs
+    )
+    try:
+        return _format_search_pkgs(hashable_pkgs)
+    except TypeError:  # other unhashable imports
+        return _format_search_pkgs.__wrapped__(hashable_pkgs)
+
+
+@functools.lru_cache(maxsize=256)
+def _format_search_pkgs(search_pkgs: tuple[Any, ...]) -> tuple[str | tuple[str, str], ...]:
     search_pkgs_canonical: list[str | tuple[str, str]] = []
     for pkg_name in search_pkgs:
         if isinstance(pkg_name, str):
@@ -59,7 +114,7 @@ def _check_and_format_search_pkgs(search_pkgs: SearchPkgs) -> SearchPkgs:
                 "Expected package import specified as a string or tuple of strings (name, alias). "
                 f"Got package = {pkg_name}."
             )
-    return search_pkgs_canonical
+    return tuple(search_pkgs_canonical)
 
 
 def _validate_config(
@@ -86,73 +141,165 @@ def _validate_config(
     return None
 
 
+@functools.cache
 def _find_obj_in_pkg(pkg_name: str, obj_type: str) -> Any | None:
-    if not importlib.util.find_spec(pkg_name):
-        raise ValueError(f"Package or module not found: '{pkg_name}'")
-
-    pkg_or_module = importlib.import_module(pkg_name)
+    try:
+        pkg_or_module = importlib.import_module(pkg_name)
+    except ModuleNotFoundError as error:
+        if error.name != pkg_name and not pkg_name.startswith(f"{error.name}."):
+            raise  # package exists but one of its own imports is missing
+        raise ValueError(f"Package or module not found: '{pkg_name}'") from error
     if (obj := getattr(pkg_or_module, obj_type, None)) is not None:
         return obj
 
     # recursively walk through all modules of the package searching for the object
     # TODO(rpeloff) add flag to disable recursive search
-    path = pkg_or_module.__path__
-    prefix = f"{pkg_or_module.__name__}."
-    for _, module_name, _ in pkgutil.walk_packages(path, prefix):
+    if not hasattr(pkg_or_module, "__path__"):
+        return None  # plain module without sub-modules to search
+    if (module_name := _find_obj_module_in_pkg(pkg_or_module, obj_type)) is None:
+        return None
+    return getattr(importlib.import_module(module_name), obj_type)
+
+
+def _list_pkg_modules(pkg: Any) -> list[tuple[str, bool]]:
+    import pkgutil
+
+    return [
+        (module_info.name, module_info.ispkg)
+        for module_info in pkgutil.iter_modules(pkg.__path__, f"{pkg.__name__}.")
+    ]
+
+
+def _find_obj_module_in_pkg(pkg: Any, obj_type: str) -> str | None:
+    # the walk state is shared by all lookups and guarded by a re-entrant lock, since importing a
+    # package module may itself resolve objects in the same package
+    with _PKG_LOCK:
+        try:
+            return _walk_pkg_modules(pkg, obj_type)
+        except BaseException:
+            # drop the walk state if interrupted (e.g. by warnings raised as errors), such that the
+            # next lookup restarts the walk instead of skipping the remaining modules
+            _PKG_MODULES.pop(pkg.__name__, None)
+            _PKG_WALK_POSITIONS.pop(pkg.__name__, None)
+            raise
+
+
+def _walk_pkg_modules(pkg: Any, obj_type: str) -> str | None:
+    # index objects by the first module of the package in which they are defined, walking the
+    # package modules incrementally so that each module is imported and indexed at most once
+    pkg_index = _PKG_INDEX.setdefault(pkg.__name__, {})
+    if (module_name := pkg_index.get(obj_type)) is not None:
+        return module_name
+
+    # objects exported by a module `__getattr__` (PEP 562 lazy modules) can not be indexed, so
+    # fall back to looking up the object in the lazy modules which have already been walked
+    lazy_modules = _PKG_LAZY_MODULES.setdefault(pkg.__name__, {})
+    for module_name, module in list(lazy_modules.items()):
+        if getattr(module, obj_type, None) is not None:
+            return pkg_index.setdefault(obj_type, module_name)
+
+    while True:
+        # walk state of (module name, is package) pairs and the position of the next module,
+        # which is read on each step since nested lookups advance (or restart) the same walk
+        if (pkg_modules := _PKG_MODULES.get(pkg.__name__)) is None:
+            pkg_modules = _PKG_MODULES[pkg.__name__] = _list_pkg_modules(pkg)
+            _PKG_WALK_POSITIONS[pkg.__name__] = 0
+        if (position := _PKG_WALK_POSITIONS[pkg.__name__]) == len(pkg_modules):
+            return None
+        module_name, is_pkg = pkg_modules[position]
+        _PKG_WALK_POSITIONS[pkg.__name__] = position + 1
+
         try:
             module = importlib.import_module(module_name)
         except Exception as error:
+            import warnings
+
             warnings.warn(f"Could not import module '{module_name}'. Error: {error}.")
             continue
 
-        if (obj := getattr(module, obj_type, None)) is not None:
-            return obj
+        # import package modules breadth-first, such that objects in top-level modules are found
+        # before importing the modules of more deeply nested sub-packages
+        if is_pkg and hasattr(module, "__path__"):
+            pkg_modules.extend(_list_pkg_modules(module))
+
+        for name, obj in vars(module).items():
+            if obj is not None:
+                pkg_index.setdefault(name, module_name)
+
+        if obj_type in pkg_index:
+            return pkg_index[obj_type]
+        if "__getattr__" in vars(module):
+            lazy_modules[module_name] = module
+            if getattr(module, obj_type, None) is not None:
+                return pkg_index.setdefault(obj_type, module_name)
+
+
+def _canonicalize_search_pkgs(search_pkgs: SearchPkgs) -> CanonicalSearchPkgs:
+    # drop duplicate packages (keeping the first) which would otherwise be searched repeatedly
+    return tuple(
+        dict.fromkeys(
+            (pkg_name, None) if isinstance(pkg_name, str) else (pkg_name[0], pkg_name[1])
+            for pkg_name in search_pkgs
+        )
+    )
 
-    return None
+
+@functools.lru_cache(maxsize=256)
+def _search_pkg_aliases(search_pkgs: CanonicalSearchPkgs) -> dict[str, str]:
+    aliases: dict[str, str] = {}
+    for pkg_name, pkg_alias in search_pkgs:
+        if pkg_alias is not None:
+            aliases.setdefault(pkg_alias, pkg_name)  # first alias takes precedence
+    return aliases
 
 
-def _resolve_object(obj_type: str, search_pkgs: SearchPkgs) -> tuple[Any, bool]:
+@functools.cache
+def _resolve_object(obj_type: str, search_pkgs: CanonicalSearchPkgs) -> tuple[Any, bool]:
     if init_obj := obj_type.endswith("()"):
         obj_type = obj_type.strip("()")
 
     if "." in obj_type:
         obj_pkg_name, obj_type = obj_type.rsplit(".", maxsplit=1)
 
-        for pkg_name in search_pkgs:
-            if isinstance(pkg_name, tuple) and obj_pkg_name == pkg_name[1]:
-                obj_pkg_name = pkg_name[0]
-                break
-
+        obj_pkg_name = _search_pkg_aliases(search_pkgs).get(obj_pkg_name, obj_pkg_name)
         obj = _find_obj_in_pkg(obj_pkg_name, obj_type)
 
         if obj is None:
-            raise ValueError(f"Could not find object '{obj_type}' in module '{pkg_name}'.")
+            raise ValueError(f"Could not find object '{obj_type}' in module '{obj_pkg_name}'.")
 
         return obj, init_obj
 
-    for pkg_name_alias in search_pkgs:
-        pkg_name = pkg_name_alias[0] if isinstance(pkg_name_alias, tuple) else pkg_name_alias
+    for pkg_name, _ in search_pkgs:
         if (obj := _find_obj_in_pkg(pkg_name, obj_type)) is not None:
             return obj, init_obj
 
     raise ValueError(
         f"Could not find object '{obj_type}' in any of the following packages: "
-        f"{', '.join(p[0] if isinstance(p, tuple) else p for p in search_pkgs)}."
+        f"{', '.join(pkg_name for pkg_name, _ in search_pkgs)}."
     )
 
 
+@functools.lru_cache(maxsize=4096)
+def _signature_param_names(obj: Any) -> tuple[str, ...]:
+    import inspect
+
+    try:
+        return tuple(inspect.signature(obj).parameters)
+    except ValueError:  # no signature found, e.g. for some builtin classes
+        return ()
+
+
 def _resolve_partial_kwargs(
     obj: Any, config_keys: Sequence[str], base_args: dict[str, Any]
 ) -> dict[str, Any]:
     if not callable(obj):
         return {}
-    obj_kwargs = {
-        key: base_args[key] for key in inspect.signature(obj).parameters if key in base_args
-    }
-    for k in config_keys:
-        if k not in obj_kwargs and k in base_args:
-            obj_kwargs[k] = base_args[k]
-    return obj_kwargs
+    try:
+        param_names = _signature_param_names(obj)
+    except TypeError:  # unhashable callable
+        param_names = _signature_param_names.__wrapped__(obj)
+    # signature parameters followed by remaining config keys (repeated keys keep their position)
+    return {key: base_args[key] for key in (*param_names, *config_keys) if key in base_args}
 
 
 def _maybe_apply_partial(
@@ -181,10 +328,87 @@ def _maybe_apply_partial(
     return wrapped_obj
 
 
+_KEYWORD_CONSTANTS = {"None": None, "True": True, "False": False}
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_expression(expr: str) -> types.CodeType | None:
+    # cache compiled expressions, including those which are not valid python expressions since
+    # raising SyntaxError is expensive and the same string values are repeated across configs
+    try:
+        return compile(expr, "<config>", "eval")
+    except SyntaxError:
+        return None
+
+
+# modules which config values may refer to (e.g. "yaml" or "importlib.import_module"), being the
+# modules imported by the config module before its imports were made lazy, which are imported
+# only once a config value refers to them
+_EVAL_MODULES = {
+    "importlib": ("importlib", "importlib.resources", "importlib.util"),
+    "inspect": ("inspect",),
+    "pkgutil": ("pkgutil",),
+    "warnings": ("warnings",),
+    "yaml": ("yaml",),
+}
+
+
+@functools.cache
+def _eval_namespace() -> dict[str, Any]:
+    # fixed namespace for evaluating config values, such that the imports and helpers of this
+    # module do not change how config strings are resolved (e.g. "os" stays a string)
+    return {
+        "__builtins__": vars(builtins),
+        "__name__": __name__,
+        "functools": functools,
+        "pathlib": pathlib,
+        "Callable": Callable,
+        "Mapping": Mapping,
+        "Sequence": Sequence,
+        "Any": Any,
+        "Union": Union,
+        "clstools": clstools,
+        "tree_utils": tree_utils,
+        "SearchPkgs": SearchPkgs,
+        "register_imports": register_imports,
+        "register_config_path": register_config_path,
+        "find_config": find_config,
+        "load_config": load_config,
+        "parse_config": parse_config,
+        "dump_config": dump_config,
+    }
+
+
+def _import_eval_module(namespace: dict[str, Any], name: str) -> Any:
+    modules = [importlib.import_module(module_name) for module_name in _EVAL_MODULES[name]]
+    namespace[name] = modules[0]
+    return modules[0]
+
+
 def _maybe_resolve_object(value: str) -> Any:
+    namespace = _eval_namespace()
+    # fast path for plain names (e.g. "relu") which are looked up exactly as `eval` would, since
+    # most string values in a config are names that otherwise raise and catch a NameError
+    if value.isidentifier():
+        if value in _KEYWORD_CONSTANTS:
+            return _KEYWORD_CONSTANTS[value]
+        if keyword.iskeyword(value):
+            return value  # `eval` raises SyntaxError
+        if value in namespace:
+            return namespace[value]
+        if value in _EVAL_MODULES:
+            return _import_eval_module(namespace, value)
+        return vars(builtins).get(value, value)
+
+    if (code := _compile_expression(value)) is None:
+        return value  # not a python expression, e.g. "cuda:0"
+    for name in code.co_names:
+        if name in _EVAL_MODULES and name not in namespace:
+            _import_eval_module(namespace, name)
     try:
-        return eval(value)
-    except (NameError, SyntaxError):
+        # evaluate with empty locals such that names assigned by the expression are discarded
+        return eval(code, namespace, {})
+    except NameError:
         return value
 
 
@@ -192,7 +416,9 @@ def _resolve_macro(macro_config: str, macros: dict[str, Any], node_path: str) ->
     macro_key = macro_config[1:]
     if macro_key[0] == "(" and macro_key[-1] == ")":  # eval basic expression with globals=macros
         expr = macro_key[1:-1]
-        return eval(expr, macros)
+        # compiled expressions are cached, compiling again only to raise for invalid expressions
+        code = _compile_expression(expr) or compile(expr, "<config>", "eval")
+        return eval(code, macros)
     if macro_key == "required":
         raise ValueError(f"Missing configuration for key '{node_path}' which is set to $required.")
     if macro_key not in macros:
@@ -201,17 +427,28 @@ def _resolve_macro(macro_config: str, macros: dict[str, Any], node_path: str) ->
     return macro_value
 
 
+def _resolve_leaf(leaf_config: str, macros: dict[str, Any], node_path: str) -> Any:
+    # classify string leaves by their first character in a single step
+    if leaf_config[:1] == "$":
+        return _resolve_macro(leaf_config, macros, node_path)
+    return _maybe_resolve_object(leaf_config)
+
+
 def _parse_config_tree(
     node_config: Any,
     kwargs: dict[str, Any],
     macros: dict[str, Any],
-    search_pkgs: SearchPkgs,
+    search_pkgs: CanonicalSearchPkgs,
     node_path: str | None = None,
 ) -> Any:
-    if isinstance(node_config, Sequence) and not isinstance(node_config, str):
+    if isinstance(node_config, str):
+        return _resolve_leaf(node_config, macros, node_path or "")
+
+    if _is_sequence_node(node_config):
+        prefix = f"{node_path}." if node_path else ""  # path prefix of items computed once
         configured_list = []
         for index, item_config in enumerate(node_config):
-            item_path = ".".join((node_path, str(index))) if node_path else str(index)
+            item_path = f"{prefix}{index}"
             configured_item = _parse_config_tree(
                 item_config, kwargs, macros, search_pkgs, node_path=item_path
             )
@@ -220,24 +457,38 @@ def _parse_config_tree(
             macros[item_path] = configured_item
         return configured_list
 
-    if isinstance(node_config, str) and node_config.startswith("$"):
-        return _resolve_macro(node_config, macros, node_path or "")
-
-    if not isinstance(node_config, Mapping):
-        if isinstance(node_config, str):
-            return _maybe_resolve_object(node_config)
+    if not tree_utils._is_mapping(node_config):
         return node_config
 
+    # path prefix of child nodes computed once per node
+    prefix = f"{node_path}." if node_path else ""
+
     configured_map = {}
+    if "type" not in node_config and all(
+        type(item_config) in _LEAF_TYPES for item_config in node_config.values()
+    ):
+        # fast path for mappings of only leaf values, which do not require node kwargs since
+        # there are no sub-trees or python configurable to pass them to
+        for key, item_config in node_config.items():
+            item_path = prefix + key
+            if isinstance(item_config, str):
+                item_config = _resolve_leaf(item_config, macros, item_path)
+            configured_map[key] = macros[item_path] = item_config
+        return configured_map
+
     # make shallow copy to avoid overwriting parent node's kwargs by node-specific kwargs
     node_kwargs = kwargs.copy()
 
-    # (1) take all non-mapping args and parse sub-trees
+    # (1) take all non-mapping args and parse sub-trees, deferring mapping args to step (2)
+    tree_items = []
     for key, item_config in node_config.items():
-        if isinstance(item_config, Mapping) or key == "type":
-            continue  # we will process mapping args or resolve node type object later
+        if key == "type":
+            continue  # we will resolve node type object later
+        if tree_utils._is_mapping(item_config):
+            tree_items.append((key, item_config))
+            continue
 
-        item_path = ".".join((node_path, key)) if node_path else key
+        item_path = prefix + key
         configured_item = _parse_config_tree(
             item_config, node_kwargs, macros, search_pkgs, node_path=item_path
         )
@@ -246,12 +497,9 @@ def _parse_config_tree(
         node_kwargs[key] = configured_item
         macros[item_path] = configured_item
 
-    # (2) iterate mapping by order and parse each sub-tree
-    for key, item_config in node_config.items():
-        if not isinstance(item_config, Mapping):
-            continue  # already processed non-mapping args in step (1)
-
-        item_path = ".".join((node_path, key)) if node_path else key
+    # (2) iterate mapping args by order and parse each sub-tree
+    for key, item_config in tree_items:
+        item_path = prefix + key
         configured_item = _parse_config_tree(
             item_config, node_kwargs, macros, search_pkgs, node_path=item_path
         )
@@ -275,13 +523,32 @@ def _parse_config_tree(
 
 def register_imports(imports: SearchPkgs) -> None:
     imports = _check_and_format_search_pkgs(imports)
-    _REGISTERED_SEARCH_PKGS.extend(imports)
+    _REGISTERED_SEARCH_PKGS.update(dict.fromkeys(imports))
 
 
 def register_config_path(path: str | pathlib.Path) -> None:
     _REGISTERED_CONFIG_PATHS.append(pathlib.Path(path))
 
 
+def clear_config_cache() -> None:
+    # reset the in-memory caches of loaded config files, resolved objects and package indices,
+    # e.g. after packages are modified or reloaded (on-disk YAML caches are not removed)
+    _CONFIG_CACHE.clear()
+    _PKG_INDEX.clear()
+    _PKG_MODULES.clear()
+    _PKG_WALK_POSITIONS.clear()
+    _PKG_LAZY_MODULES.clear()
+    for cached_function in (
+        _format_search_pkgs,
+        _find_obj_in_pkg,
+        _search_pkg_aliases,
+        _resolve_object,
+        _signature_param_names,
+        _compile_expression,
+    ):
+        cached_function.cache_clear()
+
+
 def find_config(path: str, base_path: str | None = None) -> str:
     config_path = pathlib.Path(path)
     if config_path.exists():
@@ -297,6 +564,138 @@ def find_config(path: str, base_path: str | None = None) -> str:
     raise ValueError(f"Could not determine location of config '{path}'.")
 
 
+@functools.cache
+def _yaml_safe_loader() -> Any:
+    import yaml
+
+    # prefer the LibYAML C bindings when available
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@functools.cache
+def _yaml_safe_dumper() -> Any:
+    import yaml
+
+    # prefer the LibYAML C bindings when available
+    return getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+def _needs_unflatten(tree: tree_utils.MappingTree) -> bool:
+    # check for keys that would be rewritten by flattening and unflattening the tree, which are
+    # inline tree keys x.y.z, non-string keys and empty sub-trees (dropped when flattened)
+    # NOTE: depth-first walk over items iterators, such that the stack holds the sub-trees on the
+    # current path to detect self-referencing trees (e.g. recursive YAML anchors), while other
+    # sub-trees shared by YAML anchors are visited once
+    stack = [iter(tree.items())]
+    path_ids = [id(tree)]
+    visited = {id(tree)}
+    while stack:
+        for key, value in stack[-1]:
+            if not isinstance(key, str) or "." in key:
+                return True
+            if isinstance(value, Mapping):
+                if not value:
+                    return True
+                if id(value) in path_ids:
+                    raise ValueError(f"Could not load config with self-referencing key '{key}'.")
+                if id(value) not in visited:
+                    visited.add(id(value))
+                    stack.append(iter(value.items()))
+                    path_ids.append(id(value))
+                    break
+        else:
+            stack.pop()
+            path_ids.pop()
+    return False
+
+
+def _read_sidecar(config_path: str, file_stat: tuple[int, int]) -> Any | None:
+    import json
+
+    sidecar_path = config_path + _YAML_CACHE_SUFFIX
+    try:
+        with open(sidecar_path, "rb") as reader:
+            sidecar = json.load(reader)
+    except (OSError, ValueError):
+        return None
+    # the sidecar is only used for the exact (mtime_ns, size) stat of the config it was written
+    # for, since a stale config may be restored with its original mtime (e.g. `cp -p`)
+    if not isinstance(sidecar, dict) or sidecar.get("stat") != list(file_stat):
+        return None
+    return sidecar.get("config")
+
+
+def _write_sidecar(config_path: str, file_stat: tuple[int, int], config: Any) -> None:
+    import json
+
+    try:
+        config_json = json.dumps(config, separators=(",", ":"))
+    except (TypeError, ValueError):
+        return  # config contains values which are not JSON serializable
+    if json.loads(config_json) != config:
+        return  # config contains values which do not survive a JSON round-trip
+    # store the stat of the config taken before it was read, such that an edit that lands while
+    # reading the config leaves a sidecar which does not match the modified config
+    sidecar_json = f'{{"stat":{json.dumps(list(file_stat))},"config":{config_json}}}'
+
+    # write to a temporary file and rename so readers never observe a partial sidecar
+    sidecar_path = config_path + _YAML_CACHE_SUFFIX
+    tmp_path = f"{sidecar_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as writer:
+            writer.write(sidecar_json)
+        os.replace(tmp_path, sidecar_path)
+    except OSError as error:
+        import contextlib
+        import warnings
+
+        warnings.warn(f"Could not write config cache '{sidecar_path}'. Error: {error}.")
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
+
+def _copy_config_tree(config: Any) -> Any:
+    # copy the containers of a loaded config tree, which is much faster than `copy.deepcopy` since
+    # the remaining values loaded from YAML (or JSON) are immutable scalars
+    config_type = type(config)
+    if config_type is dict:
+        return {key: _copy_config_tree(value) for key, value in config.items()}
+    if config_type is list:
+        return [_copy_config_tree(value) for value in config]
+    if config_type is set:
+        return set(config)
+    return config
+
+
+def _read_config(config_path: str, paths: str) -> tuple[Any, SearchPkgs | None]:
+    # cache parsed and validated file contents by path along with the file stat, such that files
+    # in an extends graph are parsed and validated once, and modified files are re-parsed and
+    # replace their previous cache entry
+    stat = os.stat(config_path)
+    file_stat = (stat.st_mtime_ns, stat.st_size)
+    if (cached := _CONFIG_CACHE.get(config_path)) is None or cached[0] != file_stat:
+        # optionally cache parsed file contents on disk as JSON which is much faster to parse
+        use_sidecar = os.environ.get(_YAML_CACHE_ENV) == "1"
+        config = _read_sidecar(config_path, file_stat) if use_sidecar else None
+        if from_yaml := config is None:
+            import yaml
+
+            # read raw bytes which the loader decodes itself (UTF-8 by default as per YAML spec)
+            with open(config_path, "rb") as reader:
+                config = yaml.load(reader.read(), Loader=_yaml_safe_loader())
+            # unflatten inline trees x.y.z => {x: {y: {z: ...}}} once when the file is parsed, so
+            # that cached configs are already normalized
+            if isinstance(config, Mapping) and _needs_unflatten(config):
+                config = tree_utils.expand_dict_tree(config)
+        imports = _validate_config(config, paths)
+        if use_sidecar and from_yaml:
+            _write_sidecar(config_path, file_stat, config)  # only cache valid configs
+        cached = _CONFIG_CACHE[config_path] = (file_stat, config, imports)
+    _, config, imports = cached
+    # return a copy since the loaded config is modified downstream
+    return _copy_config_tree(config), imports
+
+
 def load_config(
     paths: str | Sequence[str], base_path: str | None = None, **kwargs: Any
 ) -> tree_utils.DictTree:
@@ -304,9 +703,7 @@ def load_config(
     merged_imports: set[Any] = set()
     if isinstance(paths, str):
         config_path = find_config(paths, base_path)
-        with open(config_path) as reader:
-            config = yaml.safe_load(reader)
-            imports = _validate_config(config, paths)
+        config, imports = _read_config(config_path, paths)
 
         merged_imports.update(imports or set())
 
@@ -324,15 +721,10 @@ def load_config(
             config_queue.append(config)
             merged_imports.update(config.get("imports", set()))
 
-    # unflatten inline trees x.y.z => {x: {y: {z: ...}}}
-    config_queue = list(
-        map(tree_utils.unflatten_dict_tree, map(tree_utils.flatten_dict_tree, config_queue))
-    )
-
     # each successive config takes precedence over prior configs
-    aggregate_config: tree_utils.DictTree = functools.reduce(
-        tree_utils.merge_trees, config_queue, {}
-    )
+    aggregate_config: tree_utils.DictTree = {}
+    for config in config_queue:
+        aggregate_config = tree_utils.merge_trees(aggregate_config, config)
 
     # config overrides passed as keyword arguments
     aggregate_config = tree_utils.merge_trees(
@@ -356,6 +748,7 @@ def parse_config(
     **kwargs: Any,
 ) -> tree_utils.DictTree | tuple[tree_utils.DictTree, tree_utils.DictTree]:
     raw_config = load_config(paths, **kwargs)
+    # check node types of the whole tree before any objects are resolved or instantiated
     config_search_pkgs = _validate_config(raw_config, paths, required_keys)
 
     config_extends = raw_config.pop("extends", None)  # already parsed in `load_config`
@@ -366,7 +759,8 @@ def parse_config(
         search_pkgs.extend(config_search_pkgs)
     search_pkgs.extend(_REGISTERED_SEARCH_PKGS)
 
-    parsed_nodes = _parse_config_tree(raw_config, {}, {}, search_pkgs)
+    # canonical (name, alias) search packages are computed once and are hashable for caching
+    parsed_nodes = _parse_config_tree(raw_config, {}, {}, _canonicalize_search_pkgs(search_pkgs))
 
     if return_raw_config:
         raw_config["imports"] = search_pkgs
@@ -376,21 +770,30 @@ def parse_config(
     return parsed_nodes
 
 
-def dump_config(raw_config: tree_utils.DictTree) -> str:
+def dump_config_to(raw_config: tree_utils.DictTree, stream: TextIO) -> None:
+    import yaml
+
+    dumper = _yaml_safe_dumper()
     config_copy = raw_config.copy()
     extends = config_copy.pop("extends", None)
     imports = config_copy.pop("imports", None)
 
-    config_str = ""
+    # write config sections directly to the stream separated by blank lines
+    first_section = True
+
+    def write_section(title: str, section_config: dict[str, Any], **kwargs: Any) -> None:
+        nonlocal first_section
+        if not first_section:
+            stream.write("\n")
+        first_section = False
+        stream.write(f"# {title}:\n# {''.ljust(79, '=')}\n")
+        yaml.dump(section_config, stream, Dumper=dumper, default_flow_style=None, **kwargs)
+
     if extends:
-        config_str += f"# Extends:\n# {''.ljust(79, '=')}\n"
-        config_str += yaml.safe_dump({"extends": extends}, default_flow_style=None)
-        config_str += "\n"
+        write_section("Extends", {"extends": extends})
 
     if imports:
-        config_str += f"# Search packages:\n# {''.ljust(79, '=')}\n"
-        config_str += yaml.safe_dump({"imports": imports}, default_flow_style=None)
-        config_str += "\n"
+        write_section("Search packages", {"imports": imports})
 
     # separate macros / simple objects from tree configs
     simple_config = {}
@@ -407,9 +810,7 @@ def dump_config(raw_config: tree_utils.DictTree) -> str:
 
     # first dump macros / simple objects
     if simple_config:
-        config_str += f"# Configuration:\n# {''.ljust(79, '=')}\n"
-        config_str += yaml.safe_dump(simple_config, default_flow_style=None)
-        config_str += "\n"
+        write_section("Configuration", simple_config)
 
     # dump each tree config
     for key in sorted(tree_keys):
@@ -417,8 +818,10 @@ def dump_config(raw_config: tree_utils.DictTree) -> str:
         item_type = item_config.pop("type")
         item_config = {"type": item_type, **{k: item_config[k] for k in sorted(item_config)}}
 
-        config_str += f"# Configuration for {key}:\n# {''.ljust(79, '=')}\n"
-        config_str += yaml.safe_dump({key: item_config}, sort_keys=False, default_flow_style=None)
-        config_str += "\n"
+        write_section(f"Configuration for {key}", {key: item_config}, sort_keys=False)
 
-    return config_str.strip()
+
+def dump_config(raw_config: tree_utils.DictTree) -> str:
+    stream = io.StringIO()
+    dump_config_to(raw_config, stream)
+    return stream.getvalue().strip()
@@ -1,60 +1,142 @@
 """Utilities for tree-like data structures."""
 
-from collections.abc import Mapping
-from typing import Any, TypeVar, Union
-import warnings
+from collections.abc import Iterator, Mapping
+from typing import Any, TypeGuard, TypeVar, Union
 
 V = TypeVar("V")
 MappingTree = Mapping[Any, Union[V, "MappingTree[V]"]]
 DictTree = dict[str, Union[V, "DictTree[V]"]]
 
+# trees are mostly built from plain dicts (e.g. loaded from YAML), so check concrete types before
+# falling back to the much slower collections.abc check for other mapping types
+_NON_MAPPING_TYPES = frozenset((str, bytes, int, float, bool, type(None), list))
+
+
+def _is_mapping(value: Any) -> TypeGuard[Mapping[Any, Any]]:
+    value_type = type(value)
+    if value_type is dict:
+        return True
+    if value_type in _NON_MAPPING_TYPES:
+        return False
+    return isinstance(value, Mapping)
+
 
 def flatten_dict_tree(tree: MappingTree[V], separator: str = ".") -> dict[str, V]:
     """Flatten a tree-like dict structure into a flat dict."""
     flat = {}
-    for key, value in tree.items():
-        key = key.decode() if isinstance(key, bytes) else str(key)
-
-        if isinstance(value, Mapping):
-            for flat_key, flat_value in flatten_dict_tree(value, separator=separator).items():
-                flat_key = separator.join([key, flat_key])
-                flat[flat_key] = flat_value
-        else:
+    # depth-first walk over (key prefix, items iterator) so that leaves keep their tree order
+    stack: list[tuple[str | None, Iterator[tuple[Any, Any]]]] = [(None, iter(tree.items()))]
+    tree_ids = [id(tree)]  # ids of the sub-trees on the stack to detect self-referencing trees
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            key = key.decode() if isinstance(key, bytes) else str(key)
+            if prefix is not None:
+                key = f"{prefix}{separator}{key}"
+
+            if _is_mapping(value):
+                if id(value) in tree_ids:
+                    raise ValueError(f"Could not flatten self-referencing tree at path '{key}'.")
+                stack.append((key, iter(value.items())))
+                tree_ids.append(id(value))
+                break
             flat[key] = value
+        else:
+            stack.pop()
+            tree_ids.pop()
     return flat
 
 
 def unflatten_dict_tree(flat: Mapping[str, V], separator: str = ".") -> DictTree:
     """Unflatten a flat dict into a tree-like dict structure."""
     tree: dict[str, Any] = {}
+    # sub-trees created from flat keys by id (holding a reference so that ids are not reused),
+    # since only these can be extended by other flat keys
+    sub_trees: dict[int, dict[str, Any]] = {}
+    has_dict_values = False
     for key, value in flat.items():
-        key, *sub_keys = key.split(separator, maxsplit=1)
-
-        if sub_keys:
-            # check that existing key's value is a dict-tree
-            # otherwise raise warning and the sub-key(s) which cannot be flattened
-            if key in tree and (
-                not isinstance(tree[key], dict) or not tree[key].get("__dict_tree__", False)
-            ):
-                key_path = separator.join([key] + sub_keys)
+        *parent_keys, leaf_key = key.split(separator)
+
+        node = tree
+        for depth, parent_key in enumerate(parent_keys, start=1):
+            if parent_key not in node:
+                child = node[parent_key] = {}
+                sub_trees[id(child)] = child
+            elif id(child := node[parent_key]) not in sub_trees:
+                # existing value is not a dict-tree so raise warning and skip the flat key
+                import warnings
+
                 warnings.warn(
-                    f"Could not unflatten path '{key_path}' "
-                    f"since path '{key}' already contains value {tree[key]}"
+                    f"Could not unflatten path '{key}' "
+                    f"since path '{separator.join(parent_keys[:depth])}' "
+                    f"already contains value {child}"
                 )
-                continue
+                break
+            node = child
+        else:
+            node[leaf_key] = value
+            has_dict_values = has_dict_values or isinstance(value, dict)
+
+    # unflatten dict values remaining in the tree, walking only the sub-trees created above
+    stack = [tree] if has_dict_values else []
+    while stack:
+        node = stack.pop()
+        for key, value in node.items():
+            if isinstance(value, dict):
+                if id(value) in sub_trees:
+                    stack.append(value)
+                else:
+                    node[key] = unflatten_dict_tree(value, separator=separator)
+
+    return tree
+
 
-            if key not in tree:
-                tree[key] = {"__dict_tree__": True}
+def expand_dict_tree(tree: MappingTree[V], separator: str = ".") -> DictTree[V]:
+    """Expand inline keys x.y.z of a tree-like dict structure into nested sub-trees.
 
-            tree[key][sub_keys[0]] = value
+    Equivalent to `unflatten_dict_tree(flatten_dict_tree(tree))` without building the flat dict.
+    """
+    expanded: dict[str, Any] = {}
+    # depth-first walk over (key path, items iterator) so that leaves are visited in the same
+    # order as the flattened tree
+    stack: list[tuple[list[str], Iterator[tuple[Any, Any]]]] = [([], iter(tree.items()))]
+    tree_ids = [id(tree)]  # ids of the sub-trees on the stack to detect self-referencing trees
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            key = key.decode() if isinstance(key, bytes) else str(key)
+            path = prefix + key.split(separator)
+
+            if _is_mapping(value):
+                if id(value) in tree_ids:
+                    raise ValueError(
+                        f"Could not expand self-referencing tree at path '{separator.join(path)}'."
+                    )
+                stack.append((path, iter(value.items())))
+                tree_ids.append(id(value))
+                break
+
+            # insert leaf value, where only sub-trees created while expanding are dicts
+            node = expanded
+            for depth, sub_key in enumerate(path[:-1], start=1):
+                child = node.setdefault(sub_key, {})
+                if not isinstance(child, dict):
+                    import warnings
+
+                    warnings.warn(
+                        f"Could not unflatten path '{separator.join(path)}' "
+                        f"since path '{separator.join(path[:depth])}' "
+                        f"already contains value {child}"
+                    )
+                    break
+                node = child
+            else:
+                node[path[-1]] = value
         else:
-            tree[key] = value
+            stack.pop()
+            tree_ids.pop()
 
-    return {
-        key: unflatten_dict_tree(value, separator=separator) if isinstance(value, dict) else value
-        for key, value in tree.items()
-        if key != "__dict_tree__"
-    }
+    return expanded
 
 
 def merge_trees(tree_left: MappingTree[V], tree_right: MappingTree[V]) -> DictTree[V]:
@@ -67,22 +149,17 @@ def merge_trees(tree_left: MappingTree[V], tree_right: MappingTree[V]) -> DictTr
         - if in both left and right trees the node's value is a sub-tree, proceed to merge them
         - otherwise the node value (or sub-tree) of the right tree take precedence
     """
-    merged_tree: dict[str, Any] = {}
-    for parent, child_left in tree_left.items():
-        if parent in tree_right:
-            child_right = tree_right[parent]
-
-            if not isinstance(child_left, Mapping):
-                merged_tree[parent] = child_right
-            elif not isinstance(child_right, Mapping):
-                merged_tree[parent] = child_right
+    merged_tree: dict[str, Any] = dict(tree_left)
+    # apply right tree nodes in place, copying only the sub-trees which are merged
+    stack: list[tuple[dict[str, Any], MappingTree[V]]] = [(merged_tree, tree_right)]
+    while stack:
+        merged_node, node_right = stack.pop()
+        for parent, child_right in node_right.items():
+            child_left = merged_node.get(parent)
+            if _is_mapping(child_left) and _is_mapping(child_right):
+                merged_child = merged_node[parent] = dict(child_left)
+                stack.append((merged_child, child_right))
             else:
-                merged_tree[parent] = merge_trees(child_left, child_right)
-        else:
-            merged_tree[parent] = child_left
-
-    for parent, child_right in tree_right.items():
-        if parent not in merged_tree:
-            merged_tree[parent] = child_right
+                merged_node[parent] = child_right
 
     return merged_tree
@@ -0,0 +1,30 @@
+"""Tests for class tools."""
+
+import pickle
+
+import pytest
+
+from aperol import clstools
+
+
+class _PartialWithDict(clstools.partial_cls):
+    pass
+
+
+def test_partial_cls_pickle():
+    partial = clstools.partial_cls(clstools.partial_cls(dict, a=1), b=2)
+    assert pickle.loads(pickle.dumps(partial))(c=3) == {"a": 1, "b": 2, "c": 3}
+
+
+def test_partial_cls_pickle_namespace():
+    partial = _PartialWithDict(dict, a=1)
+    partial.attr = "value"
+    restored = pickle.loads(pickle.dumps(partial))
+    assert restored.attr == "value"
+    assert restored() == {"a": 1}
+
+
+def test_partial_cls_setstate_namespace_without_dict():
+    partial = clstools.partial_cls(dict)
+    with pytest.raises(TypeError):
+        partial.__setstate__((dict, {}, {"attr": "value"}))
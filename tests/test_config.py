@@ -0,0 +1,283 @@
+"""Tests for the config parser."""
+
+import functools
+import importlib
+import importlib.resources
+import inspect
+import io
+import json
+import os
+import pkgutil
+import subprocess
+import sys
+import threading
+import warnings
+
+import pytest
+import yaml
+
+from aperol import config
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("yaml", yaml),
+        ("inspect", inspect),
+        ("warnings", warnings),
+        ("pkgutil", pkgutil),
+        ("functools", functools),
+        ("importlib.import_module", importlib.import_module),
+        ("importlib.resources", importlib.resources),
+        ("yaml.safe_load", yaml.safe_load),
+        ("print", print),
+        ("None", None),
+        ("True", True),
+        ("1 + 2", 3),
+    ],
+)
+def test_resolve_object(value, expected):
+    assert config._maybe_resolve_object(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["os", "io", "types", "keyword", "collections", "builtins", "_LEAF_TYPES", "relu", "cuda:0"],
+)
+def test_resolve_object_keeps_string(value):
+    # config strings are not resolved against the imports and helpers of the config module
+    assert config._maybe_resolve_object(value) == value
+
+
+def test_resolve_object_imports_modules_lazily(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("a: relu\nb: [cuda:0, 1 + 2]\n")
+    code = (
+        "import sys\n"
+        "import aperol\n"
+        f"assert aperol.parse_config({str(config_path)!r}) == {{'a': 'relu', 'b': ['cuda:0', 3]}}\n"
+        "print(sorted({'importlib.resources', 'inspect', 'pkgutil'} & set(sys.modules)))\n"
+    )
+    repo_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, cwd=repo_path, check=False
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
+
+
+def test_resolve_object_does_not_modify_namespace():
+    namespace = dict(config._eval_namespace())
+    assert config._maybe_resolve_object("(x := 1)") == 1
+    assert config._eval_namespace() == namespace
+    assert config._maybe_resolve_object("x") == "x"
+
+
+def test_find_obj_in_pkg_lazy_module(tmp_path, monkeypatch):
+    pkg_path = tmp_path / "aperol_test_lazy_pkg"
+    pkg_path.mkdir()
+    (pkg_path / "__init__.py").write_text("")
+    (pkg_path / "eager.py").write_text("class Eager:\n    pass\n")
+    (pkg_path / "lazy.py").write_text(
+        "def __getattr__(name):\n"
+        "    if name in ('Lazy', 'OtherLazy'):\n"
+        "        return 42\n"
+        "    raise AttributeError(name)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    assert config._find_obj_in_pkg("aperol_test_lazy_pkg", "Lazy") == 42
+    assert config._find_obj_in_pkg("aperol_test_lazy_pkg", "Eager").__name__ == "Eager"
+    # lazy modules which have already been walked are still searched
+    assert config._find_obj_in_pkg("aperol_test_lazy_pkg", "OtherLazy") == 42
+    assert config._find_obj_in_pkg("aperol_test_lazy_pkg", "Missing") is None
+
+
+def _write_pkg(tmp_path, monkeypatch, pkg_name, modules):
+    pkg_path = tmp_path / pkg_name
+    pkg_path.mkdir()
+    (pkg_path / "__init__.py").write_text("")
+    for module_name, source in modules.items():
+        (pkg_path / f"{module_name}.py").write_text(source)
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+
+def test_find_obj_in_pkg_threads(tmp_path, monkeypatch):
+    _write_pkg(
+        tmp_path,
+        monkeypatch,
+        "aperol_test_threads_pkg",
+        {
+            "a": "import time\ntime.sleep(0.1)\n\nclass A:\n    pass\n",
+            "b": "class B:\n    pass\n",
+        },
+    )
+    results = {}
+
+    def find(obj_type):
+        results[obj_type] = config._find_obj_in_pkg("aperol_test_threads_pkg", obj_type)
+
+    threads = [threading.Thread(target=find, args=(obj_type,)) for obj_type in ("A", "B")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results["A"].__name__ == "A"
+    assert results["B"].__name__ == "B"
+
+
+def test_find_obj_in_pkg_nested_lookup(tmp_path, monkeypatch):
+    # importing a module of the package resolves another object in the same package
+    _write_pkg(
+        tmp_path,
+        monkeypatch,
+        "aperol_test_nested_pkg",
+        {
+            "a": (
+                "from aperol import config\n"
+                "B = config._find_obj_in_pkg('aperol_test_nested_pkg', 'B')\n"
+                "\nclass A:\n    pass\n"
+            ),
+            "b": "class B:\n    pass\n",
+        },
+    )
+    obj_a = config._find_obj_in_pkg("aperol_test_nested_pkg", "A")
+    assert obj_a.__name__ == "A"
+    assert importlib.import_module("aperol_test_nested_pkg.a").B.__name__ == "B"
+
+
+def test_find_obj_in_pkg_restarts_interrupted_walk(tmp_path, monkeypatch):
+    _write_pkg(
+        tmp_path,
+        monkeypatch,
+        "aperol_test_interrupted_pkg",
+        {"a_bad": "raise RuntimeError('bad module')\n", "b_good": "class Target:\n    pass\n"},
+    )
+    for _ in range(2):
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            with pytest.raises(UserWarning, match="bad module"):
+                config._find_obj_in_pkg("aperol_test_interrupted_pkg", "Target")
+
+    with pytest.warns(UserWarning, match="bad module"):
+        target = config._find_obj_in_pkg("aperol_test_interrupted_pkg", "Target")
+    assert target.__name__ == "Target"
+
+
+def test_clear_config_cache(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("a:\n  type: collections.Counter\n  b: 1\n")
+    config.parse_config(str(config_path))
+    assert config._CONFIG_CACHE
+    assert config._resolve_object.cache_info().currsize
+
+    config.clear_config_cache()
+    assert not config._CONFIG_CACHE
+    assert not config._PKG_INDEX
+    assert not config._PKG_MODULES
+    assert config._resolve_object.cache_info().currsize == 0
+    assert config._find_obj_in_pkg.cache_info().currsize == 0
+
+
+def test_parse_config_checks_types_before_resolving(tmp_path, monkeypatch):
+    (tmp_path / "aperol_test_recorder.py").write_text(
+        "CALLS = []\n\ndef record():\n    CALLS.append(1)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("a:\n  type: aperol_test_recorder.record()\n")
+
+    with pytest.raises(ValueError, match="node b.c.type"):
+        config.parse_config(str(config_path), **{"b.c.type": 3})
+    assert importlib.import_module("aperol_test_recorder").CALLS == []
+
+
+def test_format_search_pkgs_from_yaml_is_cached():
+    imports = yaml.safe_load("imports:\n  - os\n  - [collections, col]\n")["imports"]
+    config._format_search_pkgs.cache_clear()
+    assert config._check_and_format_search_pkgs(imports) == ("os", ("collections", "col"))
+    assert config._check_and_format_search_pkgs(imports) == ("os", ("collections", "col"))
+    assert config._format_search_pkgs.cache_info().hits == 1
+
+
+@pytest.mark.parametrize("imports", [[["a", "b", "c"]], [{"a": "b"}]])
+def test_format_search_pkgs_invalid(imports):
+    with pytest.raises(ValueError, match="Expected package import"):
+        config._check_and_format_search_pkgs(imports)
+
+
+def test_check_valid_config_tree_recursive_anchor():
+    config._check_valid_config_tree(yaml.safe_load("a: &x\n  - *x\n"))
+    with pytest.raises(ValueError, match="node a.1.type"):
+        config._check_valid_config_tree(yaml.safe_load("a: &x\n  - *x\n  - {type: 1}\n"))
+
+
+def test_load_config_recursive_anchor(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("a: &x\n  b: *x\n")
+    with pytest.raises(ValueError, match="self-referencing key 'b'"):
+        config.load_config(str(config_path))
+
+    # sub-trees shared by anchors are not self-referencing
+    config_path.write_text("c: &x\n  d: 1\na: *x\nb: *x\n")
+    assert config.load_config(str(config_path))["b"] == {"d": 1}
+
+
+def _write_config(path, text, mtime_ns):
+    path.write_text(text)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_load_config_reloads_modified_file(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    _write_config(config_path, "a: 1\n", 1_000_000_000)
+    assert config.load_config(str(config_path))["a"] == 1
+
+    # modified configs are re-read and replace their cache entry
+    _write_config(config_path, "a: 2\n", 2_000_000_000)
+    assert config.load_config(str(config_path))["a"] == 2
+    assert list(config._CONFIG_CACHE).count(str(config_path.resolve())) == 1
+
+    # loaded configs are copied from the cache
+    config.load_config(str(config_path))["a"] = 3
+    assert config.load_config(str(config_path))["a"] == 2
+
+
+def test_load_config_sidecar(tmp_path, monkeypatch):
+    monkeypatch.setenv(config._YAML_CACHE_ENV, "1")
+    config_path = tmp_path / "config.yaml"
+    sidecar_path = tmp_path / f"config.yaml{config._YAML_CACHE_SUFFIX}"
+    _write_config(config_path, "a.b: 1\n", 2_000_000_000)
+    config.clear_config_cache()
+    assert config.load_config(str(config_path))["a"] == {"b": 1}
+    file_stat = [2_000_000_000, config_path.stat().st_size]
+    assert json.loads(sidecar_path.read_text()) == {"stat": file_stat, "config": {"a": {"b": 1}}}
+
+    # a sidecar matching the config stat is used instead of parsing the YAML
+    sidecar_path.write_text(json.dumps({"stat": file_stat, "config": {"a": {"b": 2}}}))
+    config.clear_config_cache()
+    assert config.load_config(str(config_path))["a"] == {"b": 2}
+
+    # a sidecar is stale for any other config stat, e.g. an older config restored with its mtime
+    _write_config(config_path, "a.b: 3\n", 1_000_000_000)
+    config.clear_config_cache()
+    assert config.load_config(str(config_path))["a"] == {"b": 3}
+    assert json.loads(sidecar_path.read_text())["stat"][0] == 1_000_000_000
+
+
+def test_dump_config_to_matches_dump_config(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        "imports: [collections]\n"
+        "seed: 1\n"
+        "counter.type: collections.Counter\n"
+        "tree:\n"
+        "  type: collections.OrderedDict\n"
+        "  b: [1, 2]\n"
+        "  a: {x: 1}\n"
+    )
+    _, raw_config = config.parse_config(str(config_path), return_raw_config=True)
+    stream = io.StringIO()
+    config.dump_config_to(raw_config, stream)
+    assert stream.getvalue().strip() == config.dump_config(raw_config)
+    assert "# Configuration for tree:" in stream.getvalue()
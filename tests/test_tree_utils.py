@@ -0,0 +1,135 @@
+"""Tests for tree utilities."""
+
+import random
+import warnings
+
+import pytest
+
+from aperol import tree_utils
+
+
+def _random_tree(rng: random.Random, depth: int = 0) -> dict:
+    tree: dict = {}
+    for _ in range(rng.randint(0, 4)):
+        # inline tree keys x.y which may collide with other keys, and non-string keys
+        key = rng.choice(["a", "b", "c", "a.b", "b.c", "a.b.c", 1, True])
+        if depth < 3 and rng.random() < 0.5:
+            tree[key] = _random_tree(rng, depth + 1)
+        else:
+            tree[key] = rng.choice([0, 1.5, "x", None, [1, 2]])
+    return tree
+
+
+def test_flatten_unflatten_dict_tree():
+    tree = {"a": {"b": {"c": 1}, "d": 2}, "e": 3}
+    flat = tree_utils.flatten_dict_tree(tree)
+    assert flat == {"a.b.c": 1, "a.d": 2, "e": 3}
+    assert tree_utils.unflatten_dict_tree(flat) == tree
+
+
+def test_flatten_dict_tree_self_reference():
+    tree: dict = {"a": {"c": 1}}
+    tree["a"]["b"] = tree
+    with pytest.raises(ValueError, match="path 'a.b'"):
+        tree_utils.flatten_dict_tree(tree)
+
+
+def _reference_unflatten_dict_tree(flat, separator="."):
+    # previous recursive implementation, splitting one level of keys per call
+    tree = {}
+    for key, value in flat.items():
+        key, *sub_keys = key.split(separator, maxsplit=1)
+        if sub_keys:
+            if key in tree and (
+                not isinstance(tree[key], dict) or not tree[key].get("__dict_tree__", False)
+            ):
+                continue
+            tree.setdefault(key, {"__dict_tree__": True})[sub_keys[0]] = value
+        else:
+            tree[key] = value
+    return {
+        key: _reference_unflatten_dict_tree(value, separator) if isinstance(value, dict) else value
+        for key, value in tree.items()
+        if key != "__dict_tree__"
+    }
+
+
+def _random_flat(rng: random.Random) -> dict:
+    flat: dict = {}
+    for _ in range(rng.randint(0, 6)):
+        key = ".".join(rng.choice("ab") for _ in range(rng.randint(1, 3)))
+        if rng.random() < 0.2:
+            flat[key] = _random_flat(rng)  # dict values are unflattened as well
+        else:
+            flat[key] = rng.randint(0, 9)
+    return flat
+
+
+@pytest.mark.parametrize(
+    "flat, message",
+    [
+        ({"a": 1, "a.b": 2}, "path 'a.b' since path 'a' already contains value 1"),
+        ({"a": {"x": 1}, "a.b": 2}, "path 'a.b' since path 'a' already contains value {'x': 1}"),
+    ],
+)
+def test_unflatten_dict_tree_conflict(flat, message):
+    # flat keys can not extend scalars or dicts which are values of the flat input
+    with pytest.warns(UserWarning, match=message):
+        assert tree_utils.unflatten_dict_tree(flat) == {"a": flat["a"]}
+
+
+def test_unflatten_dict_tree_dict_values():
+    flat = {"a": {"b.c": 1, "d": {"e.f": 2}}, "g.h": {"i.j": 3}}
+    assert tree_utils.unflatten_dict_tree(flat) == {
+        "a": {"b": {"c": 1}, "d": {"e": {"f": 2}}},
+        "g": {"h": {"i": {"j": 3}}},
+    }
+    assert flat == {"a": {"b.c": 1, "d": {"e.f": 2}}, "g.h": {"i.j": 3}}
+
+
+def test_unflatten_dict_tree_overwritten_sub_tree_conflict():
+    # the conflict within sub-tree 'a' warns although the sub-tree is overwritten by a later key
+    with pytest.warns(UserWarning, match="path 'a.b.c' since path 'a.b' already contains value 1"):
+        assert tree_utils.unflatten_dict_tree({"a.b": 1, "a.b.c": 2, "a": 3}) == {"a": 3}
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_unflatten_dict_tree_matches_reference(seed):
+    flat = _random_flat(random.Random(seed))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert tree_utils.unflatten_dict_tree(flat) == _reference_unflatten_dict_tree(flat)
+
+
+def test_merge_trees():
+    tree_left = {"a": {"b": 1, "c": 2}, "x": 1}
+    tree_right = {"a": {"c": 3, "d": 4}, "x": {"y": 1}}
+    assert tree_utils.merge_trees(tree_left, tree_right) == {
+        "a": {"b": 1, "c": 3, "d": 4},
+        "x": {"y": 1},
+    }
+    assert tree_left == {"a": {"b": 1, "c": 2}, "x": 1}
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_expand_dict_tree_matches_flatten_unflatten(seed):
+    tree = _random_tree(random.Random(seed))
+    with warnings.catch_warnings():
+        # trees with colliding keys warn, possibly in a different order
+        warnings.simplefilter("ignore")
+        expected = tree_utils.unflatten_dict_tree(tree_utils.flatten_dict_tree(tree))
+        assert tree_utils.expand_dict_tree(tree) == expected
+
+
+def test_expand_dict_tree_self_reference():
+    tree: dict = {"x.y": 1, "a": {}}
+    tree["a"]["b"] = tree["a"]
+    with pytest.raises(ValueError, match="path 'a.b'"):
+        tree_utils.expand_dict_tree(tree)
+
+    # shared sub-trees which are not self-referencing are expanded
+    shared = {"c.d": 1}
+    assert tree_utils.expand_dict_tree({"a": shared, "b": shared}) == {
+        "a": {"c": {"d": 1}},
+        "b": {"c": {"d": 1}},
+    }